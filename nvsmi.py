@@ -6,10 +6,19 @@ This script highly depends on Python reflection, DO NOT use `from __future__ imp
 
 import re
 import json
+import time
 import subprocess
-from copy import deepcopy
 from argparse import ArgumentParser
-from typing import List, Dict, Literal, Callable, Union, Any
+from typing import List, Dict, Tuple, Set, Literal, Callable, Iterator, Optional, Union, Any
+
+try:
+  import annotationlib   # py3.14+, class annotations are evaluated lazily
+except ImportError:
+  annotationlib = None
+try:
+  import pynvml   # optional: pip install nvidia-ml-py
+except ImportError:
+  pynvml = None
 
 __all__ = [
   'NVSMI',
@@ -18,15 +27,107 @@ __all__ = [
   'NVSMI_Dynamic',
 ]
 
-T_type = type(type)
-
-
-def regex_find(template: str, pattern: str) -> str:
-  match = re.search(pattern, template)
-  if not match: return ''
+T_index = Tuple[Dict[bytes, bytes], Dict[bytes, Any]]   # (title => value, title => sub-section T_index)
+
+# nvidia-smi output is pure ASCII, parsed as bytes (where re.ASCII is implied)
+REGEX_NUMBER = re.compile(rb'[\d\.]+')
+
+# NVML enum values => nvidia-smi display names
+NVML_BRAND_NAMES = {
+  1: 'Quadro',
+  2: 'Tesla',
+  3: 'NVS',
+  5: 'GeForce',
+  6: 'Titan',
+  12: 'Quadro RTX',
+  13: 'NVIDIA RTX',
+  14: 'NVIDIA',
+  15: 'GeForce RTX',
+  16: 'Titan RTX',
+}
+NVML_ARCH_NAMES = {
+  2: 'Kepler',
+  3: 'Maxwell',
+  4: 'Pascal',
+  5: 'Volta',
+  6: 'Turing',
+  7: 'Ampere',
+  8: 'Ada Lovelace',
+  9: 'Hopper',
+  10: 'Blackwell',
+}
+
+# (nvidia-smi --query-gpu field, attr path on info tree), see `nvidia-smi --help-query-gpu`
+_CSV_FIELDS_STATIC: Tuple[Tuple[str, str], ...] = (
+  ('name',                     'Product_Name'),
+  ('uuid',                     'GPU_UUID'),
+  ('vbios_version',            'VBIOS_Version'),
+  ('pci.bus',                  'PCI.Bus'),
+  ('pci.device',               'PCI.Device'),
+  ('pci.domain',               'PCI.Domain'),
+  ('pci.device_id',            'PCI.Device_Id'),
+  ('pci.bus_id',               'PCI.Bus_Id'),
+  ('pci.sub_device_id',        'PCI.Sub_System_Id'),
+  ('pcie.link.gen.max',        'PCI.GPU_Link_Info.PCIe_Generation.Max'),
+  ('pcie.link.gen.gpumax',     'PCI.GPU_Link_Info.PCIe_Generation.Device_Max'),
+  ('pcie.link.width.max',      'PCI.GPU_Link_Info.Link_Width.Max'),
+  ('memory.total',             'FB_Memory_Usage.Total'),
+  ('power.default_limit',      'GPU_Power_Readings.Default_Power_Limit'),
+  ('power.min_limit',          'GPU_Power_Readings.Min_Power_Limit'),
+  ('power.max_limit',          'GPU_Power_Readings.Max_Power_Limit'),
+  ('clocks.max.graphics',      'Max_Clocks.Graphics'),
+  ('clocks.max.sm',            'Max_Clocks.SM'),
+  ('clocks.max.memory',        'Max_Clocks.Memory'),
+)
+_CSV_FIELDS_DYNAMIC: Tuple[Tuple[str, str], ...] = (
+  ('timestamp',                'Timestamp'),
+  ('driver_version',           'Driver_Version'),
+  ('display_active',           'Display_Active'),
+  ('driver_model.current',     'Driver_Model.Current'),
+  ('driver_model.pending',     'Driver_Model.Pending'),
+  ('pcie.link.gen.current',    'PCI.GPU_Link_Info.PCIe_Generation.Current'),
+  ('pcie.link.gen.gpucurrent', 'PCI.GPU_Link_Info.PCIe_Generation.Device_Current'),
+  ('pcie.link.gen.hostmax',    'PCI.GPU_Link_Info.PCIe_Generation.Host_Max'),
+  ('pcie.link.width.current',  'PCI.GPU_Link_Info.Link_Width.Current'),
+  ('fan.speed',                'Fan_Speed'),
+  ('pstate',                   'Performance_State'),
+  ('memory.reserved',          'FB_Memory_Usage.Reserved'),
+  ('memory.used',              'FB_Memory_Usage.Used'),
+  ('memory.free',              'FB_Memory_Usage.Free'),
+  ('utilization.gpu',          'Utilization.GPU'),
+  ('utilization.memory',       'Utilization.Memory'),
+  ('utilization.encoder',      'Utilization.Encoder'),
+  ('utilization.decoder',      'Utilization.Decoder'),
+  ('utilization.jpeg',         'Utilization.JPEG'),
+  ('utilization.ofa',          'Utilization.OFA'),
+  ('temperature.gpu',          'Temperature.GPU_Current_Temp'),
+  ('enforced.power.limit',     'GPU_Power_Readings.Current_Power_Limit'),
+  ('power.limit',              'GPU_Power_Readings.Requested_Power_Limit'),
+  ('power.draw.average',       'GPU_Power_Readings.Average_Power_Draw'),
+  ('power.draw.instant',       'GPU_Power_Readings.Instantaneous_Power_Draw'),
+  ('clocks.gr',                'Clocks.Graphics'),
+  ('clocks.sm',                'Clocks.SM'),
+  ('clocks.mem',               'Clocks.Memory'),
+  ('clocks.video',             'Clocks.Video'),
+)
+# csv values differ in format from the `nvidia-smi -q` ones
+_CSV_FIELD_FORMATS: Dict[str, bytes] = {
+  'pcie.link.width.max':     b'%sx',
+  'pcie.link.width.current': b'%sx',
+}
+# attr path => (names of the nodes to walk down, name of the field), split once rather than per parse
+_CSV_PATHS: Dict[str, Tuple[Tuple[str, ...], str]] = {
+  path: (tuple(path.split('.')[:-1]), path.split('.')[-1])
+  for _, path in _CSV_FIELDS_STATIC + _CSV_FIELDS_DYNAMIC
+}
+
+
+def regex_find(template: bytes, pattern: re.Pattern) -> bytes:
+  match = pattern.search(template)
+  if not match: return b''
   return match.group(0)
 
-def str_to_num(s: str) -> Union[int, float]:
+def str_to_num(s: Union[str, bytes]) -> Union[int, float]:
   try:
     fval = float(s)
     ival = int(fval)
@@ -34,51 +135,124 @@ def str_to_num(s: str) -> Union[int, float]:
   except:
     return -1
 
-def lines_find_line(lines: List[str], title: str) -> str:
-  for line in lines:
-    if title in line:
-      return line
-  return ''
-
-def lines_find_section(lines: List[str], title: str) -> List[str]:
-  section: List[str] = []
-  found, indent = False, -1
-  count_leading_spaces: Callable[[str], int] = lambda line: len(line) - len(line.lstrip(' '))
+def mw_to_w(mw: int) -> Union[int, float]:
+  return str_to_num(mw / 1000)
+
+def index_lines(lines: List[bytes], titles: Set[bytes] = None) -> T_index:
+  ''' walk the lines once, build the tree of indented sections, each indexing its `title: value` pairs and sub-sections by title (first match wins);
+  if `titles` is specified, only those titles are indexed, and a section not titled so is dropped along with its whole subtree '''
+  root: T_index = ({}, {})
+  opened: List[Tuple[int, Optional[T_index]]] = [(-1, root)]    # stack of (indent, section), None for a dropped section
   for line in lines:
-    if title == line.strip():
-      found = True
-      indent = count_leading_spaces(line)
-      section.append(line)
+    text = line.lstrip(b' ')   # stripped once, reused for both indent and title
+    indent = len(line) - len(text)
+    while opened[-1][0] >= indent:
+      opened.pop()
+    if opened[-1][1] is None: continue
+    title, sep, value = text.partition(b':')
+    title = title.rstrip()
+    if titles is not None and title not in titles:
+      if not sep and title: opened.append((indent, None))
       continue
-    if found:
-      if count_leading_spaces(line) > indent:
-        section.append(line)
-      else:
-        break   # only match the first section
-  return section
-
-def run_cmd(cmd_args: List[str]) -> List[str]:
+    kv, sections = opened[-1][1]
+    if sep:
+      kv.setdefault(title, value.strip())
+    elif title:
+      section: T_index = ({}, {})
+      sections.setdefault(title, section)   # a later same-titled section is filled but dropped
+      opened.append((indent, section))
+  return root
+
+def run_cmd(cmd_args: List[str], text: bool = True) -> Union[List[str], List[bytes]]:
+  ''' text=False keeps the raw bytes output, saves decoding what will not be read as a string anyway '''
   executable = cmd_args[0]
   try:
-    p = subprocess.run(cmd_args, capture_output=True, text=True, check=True)
+    p = subprocess.run(cmd_args, capture_output=True, text=text, check=True)
   except FileNotFoundError:
     raise RuntimeError(f"{executable} not found in PATH")
   except subprocess.CalledProcessError as e:
-    raise RuntimeError(f"{executable} failed: {e}")
-  return p.stdout.strip().split('\n')
-
-def merge_object_attrs(objA: object, objB: object):
-  ''' deep copy and merge attrs objA <- objB '''
-  for name, value in vars(objB).items():
-    if name not in objA:
-      objA[name] = deepcopy(value)
+    output = (e.stderr or e.stdout).strip()   # nvidia-smi reports most errors to stdout
+    if isinstance(output, bytes): output = output.decode(errors='replace')
+    raise RuntimeError(f"{executable} failed: {e} {output}")
+  return p.stdout.strip().split('\n' if text else b'\n')
+
+def nvml_call(fn_name: str, *args, const: str = None, post: Callable[[Any], Any] = None) -> Any:
+  ''' call pynvml.<fn_name>(*args, pynvml.<const>), returns 'N/A' if the api or enum const is missing (e.g. old bindings) or not supported '''
+  fn = getattr(pynvml, fn_name, None)
+  if fn is None: return 'N/A'
+  if const is not None:
+    if not hasattr(pynvml, const): return 'N/A'
+    args += (getattr(pynvml, const),)
+  try:
+    value = fn(*args)
+  except pynvml.NVMLError:
+    return 'N/A'
+  if isinstance(value, bytes): value = value.decode()
+  return post(value) if post else value
+
+def query_csv(fields: Tuple[Tuple[str, str], ...], device_id: int = None) -> Dict[int, List[bytes]]:
+  ''' device_id => csv row of field values, for all GPUs if device_id is not given;
+  raises ValueError if some field is not known to this driver version, RuntimeError on other failures '''
+  cmd_args = ['nvidia-smi', '--query-gpu=index,' + ','.join(field for field, _ in fields), '--format=csv,noheader,nounits']
+  if device_id is not None:
+    cmd_args += ['-i', str(device_id)]
+  try:
+    lines = run_cmd(cmd_args, text=False)
+  except RuntimeError as e:
+    if 'is not a valid field to query' in str(e): raise ValueError(str(e))
+    raise
+  rows: Dict[int, List[bytes]] = {}
+  for line in lines:
+    index, *values = line.split(b', ')
+    rows[int(index)] = values
+  return rows
+
+def merge_dicts(dA: dict, dB: dict) -> dict:
+  ''' recursively merge dA <- dB inplace, a nested dict of dA is copied before merged into, hence dB is never modified '''
+  for key, value in dB.items():
+    if isinstance(value, dict) and isinstance(dA.get(key), dict):
+      dA[key] = merge_dicts(dict(dA[key]), value)
     else:
-      merge_object_attrs(objA[name], deepcopy(value))
-  return objA
-
+      dA[key] = value
+  return dA
+
+
+class SlotsMeta(type):
+  ''' declare the annotated fields as `__slots__`, saves the per-instance `__dict__` and speeds up attr access '''
+
+  def __new__(mcls, name: str, bases: tuple, namespace: Dict[str, Any]):
+    if '__slots__' not in namespace:
+      annotations = namespace.get('__annotations__')
+      if annotations is None and annotationlib is not None:
+        # py3.14+: no `__annotations__` in the class namespace, only the deferred annotate function
+        annotate = annotationlib.get_annotate_from_class_namespace(namespace)
+        if annotate is not None:
+          annotations = annotationlib.call_annotate_function(annotate, annotationlib.Format.FORWARDREF)
+      namespace['__slots__'] = tuple(annotations or ())
+    return super().__new__(mcls, name, bases, namespace)
+
+
+class SMixin:
+
+  __slots__ = ()
+
+  def __init_subclass__(cls, **kwargs):
+    ''' schedule of (name, title, title in bytes, vtype, is_nested) per annotated field, reflected once at class creation '''
+    super().__init_subclass__(**kwargs)
+    cls._schedule = tuple(
+      (name, name.replace('_', ' '), name.replace('_', ' ').encode(), vtype, isinstance(vtype, type) and issubclass(vtype, SMixin))
+      for name, vtype in cls.__annotations__.items()
+    )
+    cls._vtypes = {name: vtype for name, _, _, vtype, _ in cls._schedule}
+    # nested classes are always defined before their owner, thus already have their own titles
+    cls._titles = frozenset(title_b for _, _, title_b, _, _ in cls._schedule).union(
+      *[vtype._titles for _, _, _, vtype, is_nested in cls._schedule if is_nested]
+    )
 
 class DMixin:
 
+  __slots__ = ()
+
   def __contains__(self, name: str) -> bool:
     return hasattr(self, name)
 
@@ -88,44 +262,101 @@ class DMixin:
   def __setitem__(self, name: str, value: Any):
     setattr(self, name, value)
 
-class IMixin:
+class IMixin(SMixin):
+
+  __slots__ = ()
 
-  def from_line(vtype: type, line: str) -> Union[str, int, float]:
-    p = line.find(':')
-    if p < 0: return 'N/A'
-    val_s = line[p + 1:].strip()
+  def from_value(vtype: type, val_s: bytes) -> Union[str, int, float]:
     if vtype in (int, float):
-      val_s = regex_find(val_s, r'[\d\.]+')   # extract numerical part
-      return str_to_num(val_s)
+      num = str_to_num(val_s.partition(b' ')[0])   # fast path for the common '<number> <unit>'
+      if num == -1:
+        num = str_to_num(regex_find(val_s, REGEX_NUMBER))   # extract numerical part
+      return num
     else:
-      return val_s
+      return val_s.decode()
 
   @classmethod
-  def from_lines(cls, lines: List[str]):
+  def from_lines(cls, lines: List[bytes]):
+    return IMixin.from_lines_shared(lines, cls)[0]
+
+  @staticmethod
+  def from_lines_shared(lines: List[bytes], *classes: type) -> tuple:
+    ''' parse multiple info trees from the same lines in one go '''
+    return IMixin.from_index_shared(index_lines(lines, IMixin.schema_titles(*classes)), *classes)
+
+  @staticmethod
+  def from_index_shared(index: T_index, *classes: type) -> tuple:
+    ''' fill multiple info trees from the same section index, same-titled sections are walked only once '''
+    kv, sections = index
+    objs = tuple(cls() for cls in classes)
+    nested: Dict[bytes, List[Tuple[Any, str, type]]] = {}   # title => [(owner, name, vtype)]
+    for obj in objs:
+      for name, _, title, vtype, is_nested in obj._schedule:
+        if is_nested:
+          nested.setdefault(title, []).append((obj, name, vtype))
+        else:
+          val_s = kv.get(title)
+          object.__setattr__(obj, name, 'N/A' if val_s is None else IMixin.from_value(vtype, val_s))   # fresh object, no dict cache to invalidate
+    for title, targets in nested.items():
+      subobjs = IMixin.from_index_shared(sections.get(title, ({}, {})), *[vtype for _, _, vtype in targets])
+      for (obj, name, _), subobj in zip(targets, subobjs):
+        object.__setattr__(obj, name, subobj)
+    return objs
+
+  @staticmethod
+  def schema_titles(*classes: type) -> Set[bytes]:
+    ''' titles of all the fields, recursively including that of the nested classes '''
+    return set().union(*[cls._titles for cls in classes])
+
+  @classmethod
+  def from_csv(cls, fields: Tuple[Tuple[str, str], ...], values: List[bytes]):
+    obj = cls.from_lines([])    # all fields 'N/A'
+    for (field, path), val_s in zip(fields, values):
+      if val_s.startswith(b'['): continue    # '[N/A]', '[Not Supported]'
+      names, name = _CSV_PATHS[path]
+      node = obj
+      for n in names: node = node[n]
+      if field in _CSV_FIELD_FORMATS:
+        val_s = _CSV_FIELD_FORMATS[field] % val_s
+      node[name] = cls.from_value(type(node)._vtypes[name], val_s)
+    return obj
+
+  @classmethod
+  def from_dict(cls, data: Dict[str, Any]):
+    ''' inverse of `to_dict()`, e.g. to restore a tree saved as json '''
     obj = cls()
-    for name, vtype in obj.__annotations__.items():
-      title = name.replace('_', ' ')
-      if type(vtype) == T_type and issubclass(vtype, IOMixin):
-        section = lines_find_section(lines, title)
-        obj[name] = vtype.from_lines(section)
+    for name, title, _, vtype, is_nested in obj._schedule:
+      if is_nested:
+        obj[name] = vtype.from_dict(data.get(title, {}))
       else:
-        line = lines_find_line(lines, title)
-        obj[name] = cls.from_line(vtype, line)
+        obj[name] = data.get(title, 'N/A')
     return obj
 
-class OMixin:
+class OMixin(SMixin):
+
+  __slots__ = ('_dict_cache',)
+
+  def __setattr__(self, name: str, value: Any):
+    super().__setattr__(name, value)
+    if name != '_dict_cache':
+      super().__setattr__('_dict_cache', None)
 
   def to_dict(self) -> Dict[str, Any]:
+    ''' built once and cached until any field is re-assigned, the returned dict is shared so do not modify it '''
+    data = getattr(self, '_dict_cache', None)
+    # also rebuild if any nested object has rebuilt its own dict
+    if data is not None and all(data[title] is self[name].to_dict() for name, title, _, _, is_nested in self._schedule if is_nested and title in data):
+      return data
     data = {}
-    for name, vtype in self.__annotations__.items():
-      if name in data: continue
+    for name, title, _, _, is_nested in self._schedule:
+      if title in data: continue
       value = self[name]
       if value == 'N/A': continue
-      title = name.replace('_', ' ')
-      if type(vtype) == T_type and issubclass(vtype, OMixin):
+      if is_nested:
         data[title] = value.to_dict()
       else:
         data[title] = value
+    self._dict_cache = data
     return data
 
   def __dict__(self):
@@ -137,10 +368,10 @@ class OMixin:
   def __str__(self):
     return str(self.to_dict())
 
-class IOMixin(IMixin, OMixin, DMixin):
+class IOMixin(IMixin, OMixin, DMixin, metaclass=SlotsMeta):
   pass
 
-class NVSMI_Entry(OMixin, DMixin):
+class NVSMI_Entry(OMixin, DMixin, metaclass=SlotsMeta):
 
   device_id: int
   model: str
@@ -148,7 +379,7 @@ class NVSMI_Entry(OMixin, DMixin):
 
   def __init__(self, **kwargs):
     for name, value in kwargs.items():
-      if name in self.__annotations__:
+      if name in self._vtypes:
         self[name] = value
 
 class NVSMI_Static(IOMixin):
@@ -205,6 +436,54 @@ class NVSMI_Static(IOMixin):
   GPU_Power_Readings         : NVSMI_GPU_Power_Readings
   Max_Clocks                 : NVSMI_Max_Clocks
 
+  @classmethod
+  def from_nvml(cls, handle: Any):
+    obj = cls.from_lines([])    # all fields 'N/A'
+    obj.Product_Name           = nvml_call('nvmlDeviceGetName', handle)
+    obj.Product_Brand          = nvml_call('nvmlDeviceGetBrand', handle, post=lambda v: NVML_BRAND_NAMES.get(v, 'N/A'))
+    obj.Product_Architecture   = nvml_call('nvmlDeviceGetArchitecture', handle, post=lambda v: NVML_ARCH_NAMES.get(v, 'N/A'))
+    obj.GPU_UUID               = nvml_call('nvmlDeviceGetUUID', handle)
+    obj.VBIOS_Version          = nvml_call('nvmlDeviceGetVbiosVersion', handle)
+    obj.MultiGPU_Board         = nvml_call('nvmlDeviceGetMultiGpuBoard', handle, post=lambda v: 'Yes' if v else 'No')
+    obj.Board_ID               = nvml_call('nvmlDeviceGetBoardId', handle, post=lambda v: f'0x{v:x}')
+    obj.GPU_Part_Number        = nvml_call('nvmlDeviceGetBoardPartNumber', handle)
+
+    pci = nvml_call('nvmlDeviceGetPciInfo', handle)
+    if pci != 'N/A':
+      obj.PCI.Bus              = f'0x{pci.bus:02X}'
+      obj.PCI.Device           = f'0x{pci.device:02X}'
+      obj.PCI.Domain           = f'0x{pci.domain:04X}'
+      obj.PCI.Device_Id        = f'0x{pci.pciDeviceId:08X}'
+      obj.PCI.Bus_Id           = pci.busId.decode() if isinstance(pci.busId, bytes) else pci.busId
+      obj.PCI.Sub_System_Id    = f'0x{pci.pciSubSystemId:08X}'
+    link = obj.PCI.GPU_Link_Info
+    link.PCIe_Generation.Max        = nvml_call('nvmlDeviceGetMaxPcieLinkGeneration', handle)
+    link.PCIe_Generation.Device_Max = nvml_call('nvmlDeviceGetGpuMaxPcieLinkGeneration', handle)
+    link.Link_Width.Max             = nvml_call('nvmlDeviceGetMaxPcieLinkWidth', handle, post=lambda v: f'{v}x')
+
+    obj.FB_Memory_Usage.Total   = nvml_call('nvmlDeviceGetMemoryInfo', handle, post=lambda v: v.total >> 20)
+    obj.BAR1_Memory_Usage.Total = nvml_call('nvmlDeviceGetBAR1MemoryInfo', handle, post=lambda v: v.bar1Total >> 20)
+
+    temp = obj.Temperature
+    temp.GPU_Shutdown_Temp      = nvml_call('nvmlDeviceGetTemperatureThreshold', handle, const='NVML_TEMPERATURE_THRESHOLD_SHUTDOWN')
+    temp.GPU_Slowdown_Temp      = nvml_call('nvmlDeviceGetTemperatureThreshold', handle, const='NVML_TEMPERATURE_THRESHOLD_SLOWDOWN')
+    temp.GPU_Max_Operating_Temp = nvml_call('nvmlDeviceGetTemperatureThreshold', handle, const='NVML_TEMPERATURE_THRESHOLD_GPU_MAX')
+    temp.GPU_Target_Temperature = nvml_call('nvmlDeviceGetTemperatureThreshold', handle, const='NVML_TEMPERATURE_THRESHOLD_ACOUSTIC_CURR')
+
+    power = obj.GPU_Power_Readings
+    power.Default_Power_Limit = nvml_call('nvmlDeviceGetPowerManagementDefaultLimit', handle, post=mw_to_w)
+    limits = nvml_call('nvmlDeviceGetPowerManagementLimitConstraints', handle)
+    if limits != 'N/A':
+      power.Min_Power_Limit   = mw_to_w(limits[0])
+      power.Max_Power_Limit   = mw_to_w(limits[1])
+
+    clocks = obj.Max_Clocks
+    clocks.Graphics = nvml_call('nvmlDeviceGetMaxClockInfo', handle, const='NVML_CLOCK_GRAPHICS')
+    clocks.SM       = nvml_call('nvmlDeviceGetMaxClockInfo', handle, const='NVML_CLOCK_SM')
+    clocks.Memory   = nvml_call('nvmlDeviceGetMaxClockInfo', handle, const='NVML_CLOCK_MEM')
+    clocks.Video    = nvml_call('nvmlDeviceGetMaxClockInfo', handle, const='NVML_CLOCK_VIDEO')
+    return obj
+
 class NVSMI_Dynamic(IOMixin):
   class NVSMI_Driver_Model(IOMixin):
     Current: Union[Literal['WDDM'], Literal['TCC']]
@@ -267,40 +546,240 @@ class NVSMI_Dynamic(IOMixin):
   GPU_Power_Readings         : NVSMI_GPU_Power_Readings
   Clocks                     : NVSMI_Clocks
 
-class NVSMI(OMixin, DMixin):
+  @classmethod
+  def from_nvml(cls, handle: Any):
+    obj = cls.from_lines([])    # all fields 'N/A'
+    obj.Timestamp         = time.asctime()
+    obj.Driver_Version    = nvml_call('nvmlSystemGetDriverVersion')
+    obj.CUDA_Version      = nvml_call('nvmlSystemGetCudaDriverVersion', post=lambda v: f'{v // 1000}.{v % 1000 // 10}')
+    obj.Display_Attached  = nvml_call('nvmlDeviceGetDisplayMode', handle, post=lambda v: 'Yes' if v else 'No')
+    obj.Display_Active    = nvml_call('nvmlDeviceGetDisplayActive', handle, post=lambda v: 'Enabled' if v else 'Disabled')
+    driver_model = nvml_call('nvmlDeviceGetDriverModel', handle)
+    if driver_model != 'N/A':
+      obj.Driver_Model.Current = 'TCC' if driver_model[0] else 'WDDM'
+      obj.Driver_Model.Pending = 'TCC' if driver_model[1] else 'WDDM'
+
+    link = obj.PCI.GPU_Link_Info
+    link.PCIe_Generation.Current = nvml_call('nvmlDeviceGetCurrPcieLinkGeneration', handle)
+    link.Link_Width.Current      = nvml_call('nvmlDeviceGetCurrPcieLinkWidth', handle, post=lambda v: f'{v}x')
+    obj.PCI.Tx_Throughput = nvml_call('nvmlDeviceGetPcieThroughput', handle, const='NVML_PCIE_UTIL_TX_BYTES')
+    obj.PCI.Rx_Throughput = nvml_call('nvmlDeviceGetPcieThroughput', handle, const='NVML_PCIE_UTIL_RX_BYTES')
+
+    obj.Fan_Speed         = nvml_call('nvmlDeviceGetFanSpeed', handle)
+    obj.Performance_State = nvml_call('nvmlDeviceGetPerformanceState', handle, post=lambda v: f'P{v}')
+
+    mem = nvml_call('nvmlDeviceGetMemoryInfo', handle)
+    if mem != 'N/A':
+      obj.FB_Memory_Usage.Used = mem.used >> 20
+      obj.FB_Memory_Usage.Free = mem.free >> 20
+    bar1 = nvml_call('nvmlDeviceGetBAR1MemoryInfo', handle)
+    if bar1 != 'N/A':
+      obj.BAR1_Memory_Usage.Used = bar1.bar1Used >> 20
+      obj.BAR1_Memory_Usage.Free = bar1.bar1Free >> 20
+
+    util = obj.Utilization
+    rates = nvml_call('nvmlDeviceGetUtilizationRates', handle)
+    if rates != 'N/A':
+      util.GPU    = rates.gpu
+      util.Memory = rates.memory
+    util.Encoder = nvml_call('nvmlDeviceGetEncoderUtilization', handle, post=lambda v: v[0])
+    util.Decoder = nvml_call('nvmlDeviceGetDecoderUtilization', handle, post=lambda v: v[0])
+    util.JPEG    = nvml_call('nvmlDeviceGetJpgUtilization', handle, post=lambda v: v[0])
+    util.OFA     = nvml_call('nvmlDeviceGetOfaUtilization', handle, post=lambda v: v[0])
+
+    obj.Temperature.GPU_Current_Temp = nvml_call('nvmlDeviceGetTemperature', handle, const='NVML_TEMPERATURE_GPU')
+
+    power = obj.GPU_Power_Readings
+    power.Current_Power_Limit   = nvml_call('nvmlDeviceGetEnforcedPowerLimit', handle, post=mw_to_w)
+    power.Requested_Power_Limit = nvml_call('nvmlDeviceGetPowerManagementLimit', handle, post=mw_to_w)
+    power.Average_Power_Draw    = nvml_call('nvmlDeviceGetPowerUsage', handle, post=mw_to_w)
+
+    clocks = obj.Clocks
+    clocks.Graphics = nvml_call('nvmlDeviceGetClockInfo', handle, const='NVML_CLOCK_GRAPHICS')
+    clocks.SM       = nvml_call('nvmlDeviceGetClockInfo', handle, const='NVML_CLOCK_SM')
+    clocks.Memory   = nvml_call('nvmlDeviceGetClockInfo', handle, const='NVML_CLOCK_MEM')
+    clocks.Video    = nvml_call('nvmlDeviceGetClockInfo', handle, const='NVML_CLOCK_VIDEO')
+    return obj
+
+# (device_id, full) => static info, which never changes once the GPU is initialized
+_STATIC_CACHE: Dict[Tuple[int, bool], NVSMI_Static] = {}
+
+class NVSMI_Overlay(OMixin, DMixin):
+  ''' zero-copy union view over info trees, the former tree wins on name conflicts; same-named sub-trees are overlaid recursively '''
+
+  def __init__(self, *layers: OMixin):
+    self._layers = layers
+
+  def __getattr__(self, name: str) -> Any:
+    if name.startswith('_'): raise AttributeError(name)
+    values = [layer[name] for layer in self._layers if name in layer]
+    if not values: raise AttributeError(name)
+    if len(values) > 1 and all(isinstance(value, OMixin) for value in values):
+      return NVSMI_Overlay(*values)
+    return values[0]
+
+  def to_dict(self) -> Dict[str, Any]:
+    data = {}
+    for layer in self._layers:
+      merge_dicts(data, layer.to_dict())
+    return data
+
+class NVSMI(NVSMI_Overlay):
+
+  # device_id => NVML device handle, shared by all queries
+  _nvml_handles = {}
+  # None: not tried yet, False: pynvml is missing or fails to init, not to be retried on every query
+  _nvml_ready = None
+  # False once `nvidia-smi --query-gpu` rejects our fields, not to be retried on every query
+  _csv_ready = True
 
-  def __init__(self, device_id: int = 0):
+  def __init__(self, device_id: int = 0, full: bool = True):
+    ''' full=False queries only the fields supported by `nvidia-smi --query-gpu`, much less output to parse;
+    the static info is queried once per device and then reused, call `refresh()` to re-query it '''
     assert isinstance(device_id, int) and device_id >= 0, 'device_id must be an integer'
     self.device_id = device_id
+    self.full = full
+
+    self.nvs = _STATIC_CACHE.get((device_id, full))
+    self.refresh(static=self.nvs is None)
+
+  def refresh(self, static: bool = True):
+    ''' re-query the dynamic info, and the static info as well if `static` '''
+    nvs = nvd = None
+    handle = self.get_nvml_handle(self.device_id)
+    if handle is not None:
+      # parsed struct, directly from the in-process NVML library
+      if static: nvs = NVSMI_Static.from_nvml(handle)
+      nvd = NVSMI_Dynamic.from_nvml(handle)
+    elif not self.full and NVSMI._csv_ready:
+      try:
+        # raw info csv row => parsed struct
+        fields = (_CSV_FIELDS_STATIC if static else ()) + _CSV_FIELDS_DYNAMIC
+        nvs, nvd = self.parse_csv_row(query_csv(fields, self.device_id)[self.device_id], static)
+      except ValueError:
+        NVSMI._csv_ready = False    # some field not known to this driver version, fallback to the full query from now on
+      except RuntimeError:
+        pass    # fallback to the full query this time, which reports the error if persists
+    if nvd is None:
+      # raw info string
+      lines = run_cmd(['nvidia-smi', '-q', '-i', str(self.device_id)], text=False)
+      # parsed struct
+      if static:
+        nvs, nvd = IMixin.from_lines_shared(lines, NVSMI_Static, NVSMI_Dynamic)
+      else:
+        nvd = NVSMI_Dynamic.from_lines(lines)
+    if static:
+      _STATIC_CACHE[(self.device_id, self.full)] = nvs
+    else:
+      nvs = self.nvs
+    self.mount(nvs, nvd)
 
-    # raw info string
-    lines = run_cmd(['nvidia-smi', '-q', '-i', str(device_id)])
-    # parsed struct
-    self.nvs = NVSMI_Static.from_lines(lines)
-    self.nvd = NVSMI_Dynamic.from_lines(lines)
-    # hijack: mount all attrs on this `self`
-    self.__annotations__ = {}
-    self.__annotations__.update(self.nvs.__annotations__)
-    self.__annotations__.update(self.nvd.__annotations__)
-    merge_object_attrs(self, self.nvs)
-    merge_object_attrs(self, self.nvd)
+  def mount(self, nvs: NVSMI_Static, nvd: NVSMI_Dynamic):
+    self.nvs = nvs
+    self.nvd = nvd
+    # attrs not found on this `self` are looked up in nvs and then nvd
+    self._layers = (nvs, nvd)
+
+  @staticmethod
+  def parse_csv_row(values: List[bytes], static: bool = True) -> Tuple[NVSMI_Static, NVSMI_Dynamic]:
+    ''' values of `_CSV_FIELDS_STATIC + _CSV_FIELDS_DYNAMIC`, or only `_CSV_FIELDS_DYNAMIC` if not `static` '''
+    n_static = len(_CSV_FIELDS_STATIC) if static else 0
+    nvs = NVSMI_Static.from_csv(_CSV_FIELDS_STATIC, values[:n_static]) if static else None
+    nvd = NVSMI_Dynamic.from_csv(_CSV_FIELDS_DYNAMIC, values[n_static:])
+    return nvs, nvd
+
+  @classmethod
+  def get_nvml_handle(cls, device_id: int) -> Any:
+    ''' cached NVML device handle, or None if pynvml is not installed or fails to init '''
+    if cls._nvml_ready is None:
+      cls._nvml_ready = pynvml is not None
+      try:
+        if cls._nvml_ready: pynvml.nvmlInit()
+      except pynvml.NVMLError:
+        cls._nvml_ready = False
+    if not cls._nvml_ready: return None
+    if device_id not in cls._nvml_handles:
+      try:
+        cls._nvml_handles[device_id] = pynvml.nvmlDeviceGetHandleByIndex(device_id)
+      except pynvml.NVMLError:
+        return None
+    return cls._nvml_handles[device_id]
 
   @staticmethod
   def list_gpus():
     lines = run_cmd(['nvidia-smi', '-L'])
 
-    REGEX_GPU_ENTRY = re.compile(r'GPU\s+(\d+):\s+([^(]+)\s+\(UUID:\s+([\w\-]+)\)')
     gpu_list: List[NVSMI_Entry] = []
     for line in lines:
-      m = REGEX_GPU_ENTRY.search(line)
-      if not m: continue
-      device_id, model, uuid = m.groups()
-      gpu_list.append(NVSMI_Entry(device_id=int(device_id), model=model, uuid=uuid))
+      # fixed format: 'GPU <id>: <name> (UUID: <uuid>)', MIG devices are indented lines thus skipped
+      if not line.startswith('GPU '): continue
+      head, _, rest = line.partition(':')
+      model, sep, uuid = rest.strip().rpartition(' (UUID: ')
+      if not sep: continue
+      gpu_list.append(NVSMI_Entry(device_id=int(head[4:]), model=model, uuid=uuid.rstrip(')')))
     return gpu_list
 
+  @staticmethod
+  def stream(device_ids: List[int] = None, interval: int = 1) -> Iterator[Dict[str, Any]]:
+    ''' yield {column: value} of each device (all devices if not given) every `interval` seconds, all read from one long-running `nvidia-smi dmon` '''
+    cmd_args = ['nvidia-smi', 'dmon', '-s', 'pucvmet', '-d', str(interval)]
+    if device_ids:
+      cmd_args += ['-i', ','.join(str(device_id) for device_id in device_ids)]
+    try:
+      p = subprocess.Popen(cmd_args, stdout=subprocess.PIPE, stderr=subprocess.STDOUT)   # default buffering, read by lines
+    except FileNotFoundError:
+      raise RuntimeError('nvidia-smi not found in PATH')
+
+    columns: List[str] = None
+    message = b''   # last line that is not a sample, i.e. the error message if dmon fails
+    with p:
+      try:
+        for line in p.stdout:
+          if line.startswith(b'#'):   # column names and then units, repeated every few samples
+            if columns is None: columns = line[1:].decode().split()
+            continue
+          values = line.split()
+          if columns is None or len(values) != len(columns):
+            message = line.strip() or message
+            continue
+          yield {
+            column: 'N/A' if val_s == b'-' else str_to_num(val_s)
+            for column, val_s in zip(columns, values)
+          }
+      except BaseException:   # incl. GeneratorExit when the consumer stops iterating
+        p.kill()
+        raise
+    if p.returncode != 0:
+      raise RuntimeError(f'nvidia-smi dmon failed with exit code {p.returncode}: {message.decode(errors="replace")}')
+
   @classmethod
-  def query_gpu(cls, device_id: int = 0):
-    return cls(device_id)
+  def query_gpu(cls, device_id: int = 0, full: bool = True):
+    return cls(device_id, full)
+
+  @classmethod
+  def query_all(cls):
+    ''' query all GPUs at once, through a single `nvidia-smi --query-gpu` call (i.e. the full=False fields) '''
+    if cls.get_nvml_handle(0) is not None:
+      return [cls(device_id) for device_id in range(pynvml.nvmlDeviceGetCount())]
+    rows = None
+    if NVSMI._csv_ready:
+      try:
+        rows = query_csv(_CSV_FIELDS_STATIC + _CSV_FIELDS_DYNAMIC)
+      except ValueError:
+        NVSMI._csv_ready = False    # some field not known to this driver version
+      except RuntimeError:
+        pass
+    if rows is None:
+      return [cls(entry.device_id) for entry in cls.list_gpus()]
+    nvsmi_list: List[NVSMI] = []
+    for device_id, values in rows.items():
+      nvsmi = cls.__new__(cls)   # bypass __init__, no more per-device query
+      nvsmi.device_id = device_id
+      nvsmi.full = False
+      nvsmi.mount(*cls.parse_csv_row(values))
+      _STATIC_CACHE[(device_id, False)] = nvsmi.nvs
+      nvsmi_list.append(nvsmi)
+    return nvsmi_list
 
   @property
   def brief(self) -> str:
@@ -319,9 +798,12 @@ if __name__ == '__main__':
   parser.add_argument('-L', '--list_gpus', action='store_true', help='list devices')
   parser.add_argument('-i', '--device_id', type=int, default=-1, help='gpu device id')
   parser.add_argument('-B', '--brief', action='store_true', help='show brief info one-line')
+  parser.add_argument('-l', '--loop', type=int, default=0, help='with -B, keep showing brief info every <loop> seconds')
   parser.add_argument('-S', '--static', action='store_true', help='show static info tree')
   parser.add_argument('-D', '--dynamic', action='store_true', help='show dynamic info tree')
   args = parser.parse_args()
+  if args.loop and not args.brief:
+    parser.error('option -l/--loop requires -B/--brief')
 
   if args.list_gpus:
     entries = NVSMI.list_gpus()
@@ -329,13 +811,25 @@ if __name__ == '__main__':
   else:
     if args.brief:
       if args.device_id < 0:
-        entries = NVSMI.list_gpus()
-        for entry in entries:
-          nvsmi = NVSMI.query_gpu(entry.device_id)
-          print(nvsmi.brief)
+        nvsmi_list = NVSMI.query_all()
       else:
-        nvsmi = NVSMI.query_gpu(args.device_id)
+        nvsmi_list = [NVSMI.query_gpu(args.device_id, full=False)]
+      for nvsmi in nvsmi_list:
         print(nvsmi.brief)
+      if args.loop > 0:
+        # one `nvidia-smi dmon` process for the whole session, rather than one query per loop
+        names = {nvsmi.device_id: nvsmi.nvs.Product_Name for nvsmi in nvsmi_list}
+        try:
+          for stats in NVSMI.stream(list(names), args.loop):
+            print(' '.join([
+              f'[{stats["gpu"]}]',
+              f'Name: {names.get(stats["gpu"], "N/A")},',
+              f'Power: {stats["pwr"]}W,',
+              f'Temp: {stats["gtemp"]}°C,',
+              f'Usage: {stats["sm"]}%',
+            ]))
+        except KeyboardInterrupt:
+          pass
     else:
       if args.device_id < 0:
         entries = NVSMI.list_gpus()
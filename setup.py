@@ -24,7 +24,9 @@ VERSION = '0.1'
 REQUIRED = []
 
 # What packages are optional?
-EXTRAS = {}
+EXTRAS = {
+  'nvml': ['nvidia-ml-py'],
+}
 
 # The rest you shouldn't have to touch too much :)
 # ------------------------------------------------
@@ -99,7 +101,7 @@ setup(
   author_email=EMAIL,
   python_requires=REQUIRES_PYTHON,
   url=URL,
-  py_modules=['nvmsi'],
+  py_modules=['nvsmi'],
   install_requires=REQUIRED,
   extras_require=EXTRAS,
   include_package_data=True,